@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+# 운영 실행: gunicorn -c gunicorn_conf.py wsgi:app
+import os, multiprocessing
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+worker_class = "gevent"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_connections = 1000
+# Render 프록시와의 연결을 유지해 요청마다 TCP를 새로 열지 않음
+keepalive = 30
+# 마스터에서 앱을 한 번만 import (UI 압축본/HMAC 템플릿 등 상수를 워커가 fork 로 공유)
+preload_app = True
+# 업스트림 timeout (3, 15) 보다 넉넉하게, 이벤트 루프가 멈춘 워커만 재시작
+timeout = 30
+graceful_timeout = 30
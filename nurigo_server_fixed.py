@@ -1,445 +1,568 @@
 # -*- coding: utf-8 -*-
-import os, json, hmac, hashlib, secrets, requests
-from datetime import datetime, timezone
-from flask import Flask, request, jsonify, Response, send_from_directory
-from flask_cors import CORS
+import os, re, sys, gzip, json, hmac, time, hashlib, logging, requests
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, abort, request, Response
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s", stream=sys.stderr)
+logger = logging.getLogger("nurigo")
 
 app = Flask(__name__)
-CORS(app)
+app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1)
+# 단건 문자는 수백 바이트, 대량 발송도 1MB면 수천 건 — 그 이상은 파싱 전에 거부
+app.config["MAX_CONTENT_LENGTH"] = 1024 * 1024
+# 단건은 LMS 최대(2000바이트, 한글 약 1000자)를 \uXXXX 로 이스케이프해도(약 6KB) 들어가도록 여유 있게
+SMS_MAX_BYTES = 16 * 1024
 
 DEFAULT_SENDER = os.getenv("DEFAULT_SENDER", "").strip()
 FORWARD_URL    = os.getenv("FORWARD_URL", "").strip()
 SOLAPI_KEY     = os.getenv("SOLAPI_KEY", "").strip()
 SOLAPI_SECRET  = os.getenv("SOLAPI_SECRET", "").strip()
 AUTH_TOKEN     = os.getenv("AUTH_TOKEN", "").strip()
+CORS_ORIGIN    = os.getenv("CORS_ORIGIN", "").strip() or "*"
+
+# 환경변수는 기동 시 한 번만 읽으므로 provider도 한 번만 결정
+PROVIDER = "forward" if FORWARD_URL else "solapi" if SOLAPI_KEY and SOLAPI_SECRET else "mock"
+
+SOLAPI_BASE_URL = "https://api.solapi.com"
+SOLAPI_BATCH_SIZE = 500
+SOLAPI_OK_PREFIX = b'{"ok":true,"provider":"solapi","response":'
+SOLAPI_SECRET_BYTES = SOLAPI_SECRET.encode("utf-8")
+SOLAPI_AUTH_PREFIX = f"HMAC-SHA256 apiKey={SOLAPI_KEY}, date="
+SOLAPI_HMAC = hmac.new(SOLAPI_SECRET_BYTES, digestmod=hashlib.sha256)  # 키 패딩(ipad/opad)까지 끝난 상태, 요청마다 copy()
+AUTH_TOKEN_BYTES = AUTH_TOKEN.encode("utf-8")
+CORS_PREFLIGHT_HEADERS = {
+    "Access-Control-Allow-Headers": "Authorization, Content-Type",
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Max-Age": "86400",
+}
+PHONE_RE = re.compile(r"^01[016789]\d{7,8}$")
+
+SEND_WORKERS = 16
+
+# POST 재시도는 업스트림이 처리하지 않았다고 확신할 수 있는 경우만 (연결 실패, 429/503).
+# 502/504나 읽기 타임아웃은 이미 발송됐을 수 있어 재시도하면 문자가 중복 발송됨.
+# Retry-After 는 따르지 않음 (urllib3 기본 상한이 6시간이라 요청/워커가 그만큼 묶임) → 짧은 지수 백오프만
+RETRY = Retry(
+    total=3, connect=3, read=0, backoff_factor=0.3,
+    status_forcelist=(429, 503), allowed_methods=frozenset(["GET", "POST"]),
+    raise_on_status=False, respect_retry_after_header=False,
+)
+
+SESSION = requests.Session()
+ADAPTER = HTTPAdapter(pool_connections=20, pool_maxsize=max(100, SEND_WORKERS), max_retries=RETRY)
+SESSION.mount("https://", ADAPTER)
+SESSION.mount("http://", ADAPTER)
+# Solapi 는 salt 를 요청별 nonce 로 보고 같은 서명 재전송을 거절 → urllib3 는 연결 실패만 재시도하고
+# 429/503 은 solapi_post 가 매번 새 서명으로 다시 보냄 (RETRY 와 같은 0.3/0.6/1.2초 백오프, Retry-After 무시)
+SOLAPI_RETRY = Retry(
+    total=3, connect=3, read=0, status=0, backoff_factor=0.3,
+    allowed_methods=frozenset(["GET", "POST"]), raise_on_status=False, respect_retry_after_header=False,
+)
+SOLAPI_ADAPTER = HTTPAdapter(pool_connections=1, pool_maxsize=max(100, SEND_WORKERS), max_retries=SOLAPI_RETRY)
+SESSION.mount(SOLAPI_BASE_URL, SOLAPI_ADAPTER)  # 더 긴 접두사가 우선 → api.solapi.com 만 이 어댑터
+SOLAPI_RETRY_STATUS = (429, 503)
+SOLAPI_RETRIES = 3
+SESSION.headers["User-Agent"] = "nurigo-sms-proxy/1.0 " + SESSION.headers["User-Agent"]
+SESSION.headers["Content-Type"] = "application/json"  # 업스트림 호출은 모두 JSON 본문
+EXECUTOR = ThreadPoolExecutor(max_workers=SEND_WORKERS)
+
+def json_dumps(obj) -> bytes:
+    if orjson: return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def json_loads(raw):
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def json_response(obj, status: int = 200):
+    return Response(json_dumps(obj), status=status, mimetype="application/json")
+
+def read_body(limit: int) -> bytes:
+    # chunked 본문은 request.stream 이 한도에서 조용히 잘라버리므로 limit+1 까지 직접 읽어 초과면 413
+    stream, chunks, size = request.stream, [], 0
+    while size <= limit:
+        chunk = stream.read(limit + 1 - size)
+        if not chunk: break
+        chunks.append(chunk)
+        size += len(chunk)
+    if size > limit: abort(413)
+    return b"".join(chunks)
+
+def parse_payload(raw: bytes):
+    # 빈 본문은 {} / 깨진 JSON 은 None (호출 측에서 400 "invalid json")
+    if not raw:
+        return {}
+    try:
+        payload = json_loads(raw)
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else {}
+
+def read_payload(limit: int):
+    return parse_payload(read_body(limit))
+
+def str_field(payload: dict, key: str) -> str:
+    # JSON 문자열만 받음 (str(...) 로 감싸 매번 새 문자열 만들지 않음), 그 외 타입은 ""
+    v = payload.get(key)
+    return v.strip() if isinstance(v, str) else ""
+
+ISO_PREFIX = (-1, "")  # (초, "YYYY-MM-DDTHH:MM:SS.") — 튜플 통째로 바꿔서 스레드 간에도 안전
+
+def utc_now_iso() -> str:
+    # datetime 객체/isoformat/replace 없이 바로 "YYYY-MM-DDTHH:MM:SS.mmmZ", 초 단위 앞부분은 재사용
+    global ISO_PREFIX
+    t = time.time()
+    sec = int(t)
+    cached_sec, prefix = ISO_PREFIX
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S.", time.gmtime(sec))
+        ISO_PREFIX = (sec, prefix)
+    return "%s%03dZ" % (prefix, int((t - sec) * 1000))
 
 def current_provider() -> str:
-    if FORWARD_URL: return "forward"
-    if SOLAPI_KEY and SOLAPI_SECRET: return "solapi"
-    return "mock"
+    return PROVIDER
+
+# 설정은 기동 후 바뀌지 않으므로 헬스체크/설정 응답 본문도 미리 직렬화
+ROOT_BODY   = json_dumps({"ok": True, "service": "nurigo-sms-proxy", "provider": PROVIDER})
+CONFIG_BODY = json_dumps({"provider": PROVIDER, "defaultFrom": DEFAULT_SENDER})
+ROOT_ETAG   = hashlib.sha256(ROOT_BODY).hexdigest()[:16]
+CONFIG_ETAG = hashlib.sha256(CONFIG_BODY).hexdigest()[:16]
+UNAUTHORIZED_BODY = json_dumps({"ok": False, "error": "unauthorized"})
+DRY_PING_BODY = json_dumps({"ok": True, "provider": "mock", "dry": True})  # dry 응답은 dry_echo 처럼 항상 mock
+
+def cached_json(body: bytes, etag: str) -> Response:
+    # 폴러/헬스체크는 If-None-Match 로 304 를 받고, 30초 동안은 아예 다시 묻지 않음
+    resp = Response(body, mimetype="application/json")
+    resp.set_etag(etag)
+    resp.cache_control.public = True
+    resp.cache_control.max_age = 30
+    return resp.make_conditional(request)
+
+@app.after_request
+def add_cors_headers(resp):
+    resp.headers["Access-Control-Allow-Origin"] = CORS_ORIGIN
+    if request.method == "OPTIONS": resp.headers.update(CORS_PREFLIGHT_HEADERS)
+    return resp
+
+@app.errorhandler(413)
+def too_large(e):
+    return json_response({"ok": False, "error": "too-large"}, 413)
 
 @app.get("/")
 def root():
-    return {"ok": True, "service": "nurigo-sms-proxy", "provider": current_provider()}, 200
+    return cached_json(ROOT_BODY, ROOT_ETAG)
 
 @app.get("/api/sms/config")
 def sms_config():
-    return jsonify({"provider": current_provider(), "defaultFrom": DEFAULT_SENDER})
+    return cached_json(CONFIG_BODY, CONFIG_ETAG)
 
 def check_auth():
     if not AUTH_TOKEN: return True, None
     got = request.headers.get("Authorization", "")
-    if got.startswith("Bearer "):
-        token = got.split(" ", 1)[1].strip()
-        if token == AUTH_TOKEN: return True, None
-    return False, (jsonify({"ok": False, "error": "unauthorized"}), 401)
+    # 토큰 비교는 상수 시간으로 (== 는 첫 불일치에서 끝나 타이밍으로 토큰이 샘)
+    if got.startswith("Bearer ") and hmac.compare_digest(got[7:].strip().encode("utf-8"), AUTH_TOKEN_BYTES):
+        return True, None
+    # Response 객체는 after_request 에서 헤더가 붙으므로 본문 bytes 만 재사용
+    return False, Response(UNAUTHORIZED_BODY, status=401, mimetype="application/json")
+
+def solapi_auth_header() -> str:
+    date_time = utc_now_iso()
+    salt = os.urandom(16).hex()
+    h = SOLAPI_HMAC.copy()
+    h.update((date_time + salt).encode("ascii"))
+    signature = h.hexdigest()
+    return f"{SOLAPI_AUTH_PREFIX}{date_time}, salt={salt}, signature={signature}"
+
+def solapi_post(path: str, body: dict):
+    data = json_dumps(body)
+    for attempt in range(SOLAPI_RETRIES + 1):
+        r = SESSION.post(
+            SOLAPI_BASE_URL + path,
+            headers={"Authorization": solapi_auth_header()},  # 시도마다 새 date/salt/서명
+            data=data,
+            timeout=(3, 15),
+        )
+        if r.status_code not in SOLAPI_RETRY_STATUS or attempt == SOLAPI_RETRIES:
+            return r
+        r.close()
+        time.sleep(0.3 * 2 ** attempt)
+
+def upstream_body(r):
+    # 업스트림이 깨진 JSON을 주더라도 이미 발송됐을 수 있으므로 예외 대신 원문으로 돌려줌
+    if "json" in r.headers.get("Content-Type", ""):
+        try:
+            return json_loads(r.content)
+        except ValueError:
+            pass
+    return r.text
+
+def dry_echo(to: str, from_num: str, text: str) -> dict:
+    return {
+        "ok": True, "provider": "mock", "dry": True,
+        "echo": {"to": to, "from": from_num, "text": text, "len": len(text)},
+        "at": utc_now_iso(),
+    }
 
 @app.post("/api/sms")
 def sms_send():
+    # 단건 본문은 앱 전역(1MB, bulk 용)보다 훨씬 작게 제한, Content-Length 가 있으면 인증/파싱 전에 거절
+    if (request.content_length or 0) > SMS_MAX_BYTES: return too_large(None)
     ok, err = check_auth()
     if not ok: return err
-    try:
-        payload = request.get_json(force=True) or {}
-    except:
-        payload = {}
-    
-    to = str(payload.get("to", "")).strip()
-    from_num = str(payload.get("from", DEFAULT_SENDER)).strip() or DEFAULT_SENDER
-    text = str(payload.get("text", "")).strip()
-    dry = bool(payload.get("dry", False))
+    # 본문 없는 POST /api/sms?dry=1 은 연결/인증 확인용 → 파싱/검증 없이 고정 응답
+    # (Content-Length 가 없는 chunked 요청도 있으므로 헤더가 아니라 실제로 읽은 본문으로 판단)
+    raw = read_body(SMS_MAX_BYTES)
+    if not raw and request.args.get("dry") == "1":
+        return Response(DRY_PING_BODY, mimetype="application/json")
+    payload = parse_payload(raw)
+    if payload is None:
+        return json_response({"ok": False, "error": "invalid json"}, 400)
+
+    to = str_field(payload, "to")
+    from_num = str_field(payload, "from") or DEFAULT_SENDER
+    text = str_field(payload, "text")
+    dry = bool(payload.get("dry", False)) or request.args.get("dry") == "1"
 
     if not to or not text:
-        return jsonify({"ok": False, "error": "missing to/text"}), 400
+        return json_response({"ok": False, "error": "missing to/text"}, 400)
+    if not PHONE_RE.match(to):
+        return json_response({"ok": False, "error": "invalid phone"}, 400)
 
     if dry:
-        return jsonify({
-            "ok": True, "provider": "mock", "dry": True,
-            "echo": {"to": to, "from": from_num, "text": text, "len": len(text)},
-            "at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
-        })
+        return json_response(dry_echo(to, from_num, text))
 
-    if FORWARD_URL:
+    if PROVIDER == "forward":
         try:
-            r = requests.post(FORWARD_URL, json={"to": to, "from": from_num, "text": text}, timeout=15)
-            return (r.text, r.status_code, {"Content-Type": r.headers.get("Content-Type", "application/json")})
-        except Exception as e:
-            return jsonify({"ok": False, "error": "forward-failed", "detail": str(e)}), 502
-
-    if SOLAPI_KEY and SOLAPI_SECRET:
+            # 클라이언트의 Accept-Encoding 을 그대로 넘기고 압축된 본문을 디코딩 없이 흘려보냄
+            r = SESSION.post(FORWARD_URL, data=json_dumps({"to": to, "from": from_num, "text": text}), timeout=(3, 15), stream=True,
+                             headers={"Accept-Encoding": request.headers.get("Accept-Encoding", "identity")})
+            resp = Response(r.raw.stream(65536, decode_content=False), status=r.status_code, content_type=r.headers.get("Content-Type", "application/json"))
+            for h in ("Content-Encoding", "Content-Length"):
+                if h in r.headers: resp.headers[h] = r.headers[h]
+            resp.call_on_close(r.close)
+            return resp
+        except requests.RequestException as e:
+            logger.warning("forward send failed: %s", e)
+            return json_response({"ok": False, "error": "forward-failed", "detail": str(e)}, 502)
+
+    if PROVIDER == "solapi":
         try:
-            date_time = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-            salt = secrets.token_hex(16)
-            signature = hmac.new(SOLAPI_SECRET.encode("utf-8"), (date_time + salt).encode("utf-8"), hashlib.sha256).hexdigest()
-            auth_header = f"HMAC-SHA256 apiKey={SOLAPI_KEY}, date={date_time}, salt={salt}, signature={signature}"
-            r = requests.post(
-                "https://api.solapi.com/messages/v4/send",
-                headers={"Content-Type": "application/json", "Authorization": auth_header},
-                json={"message": {"to": to, "from": from_num, "text": text}},
-                timeout=15,
-            )
-            out = {"ok": r.status_code < 300, "provider": "solapi", "response": r.json() if "json" in r.headers.get("Content-Type","") else r.text}
-            return (json.dumps(out, ensure_ascii=False), r.status_code, {"Content-Type": "application/json"})
-        except Exception as e:
-            return jsonify({"ok": False, "error": "solapi-failed", "detail": str(e)}), 502
-
-    return jsonify({"ok": True, "provider": "mock", "dry": True})
-
-WEB_UI_HTML = r"""<!doctype html>
-<html lang="ko"><head>
-<meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1">
-<title>서울더함수학학원 문자 전송</title>
-<style>
-:root{--b:#cbd5e1;--text:#334155;--muted:#64748b;--bg:#f8fafc;--white:#fff;--brand:#2563eb;--accent:#0ea5e9}
-*{box-sizing:border-box}
-body{font-family:system-ui,-apple-system,BlinkMacSystemFont,Segoe UI,Roboto,sans-serif;background:var(--bg);margin:0;color:var(--text)}
-.wrap{max-width:980px;margin:24px auto;padding:16px}
-.card{background:var(--white);border:1px solid #e5e7eb;border-radius:12px;padding:16px;box-shadow:0 1px 2px rgba(0,0,0,.04)}
-.controls{display:grid;gap:12px;grid-template-columns:repeat(auto-fit,minmax(220px,1fr))}
-.col{display:flex;flex-direction:column;gap:6px}
-label{font-size:12px;font-weight:600;color:var(--muted)}
-input,textarea{width:100%;padding:10px;border:1px solid var(--b);border-radius:10px;font-size:14px}
-textarea{min-height:100px;font-family:inherit}
-button{padding:10px 14px;border-radius:10px;border:1px solid var(--b);background:var(--white);cursor:pointer;font-size:14px}
-button.primary{background:var(--brand);color:var(--white);border-color:var(--brand);font-weight:600}
-.pill{padding:8px 12px;border-radius:999px;border:1px solid var(--b);background:var(--white);font-size:13px;cursor:pointer;white-space:nowrap}
-.pill.on{background:var(--accent);color:var(--white);border-color:var(--accent)}
-.grid{display:grid;gap:8px;grid-template-columns:repeat(auto-fill,minmax(110px,1fr))}
-.templates{display:flex;flex-wrap:wrap;gap:8px}
-.mt16{margin-top:16px}.mt8{margin-top:8px}
-pre{background:#0b1020;color:#c7d2fe;padding:12px;border-radius:10px;overflow:auto;font-size:12px}
-.status{font-size:13px;font-weight:600}
-.actionbar{display:flex;align-items:center;gap:12px;margin-top:16px}
-.inlinecheck{display:flex;align-items:center;gap:4px;cursor:pointer}
-</style>
-</head>
-<body>
-<div class="wrap">
-  <h2>서울더함수학학원 문자 전송</h2>
-  
-  <div class="card">
-    <div class="controls">
-      <div class="col"><label>발신번호</label><input id="fromNum" disabled></div>
-      <div class="col"><label>학생 검색</label><input id="search" placeholder="이름 검색..."></div>
-    </div>
-  </div>
-
-  <div class="card mt16">
-    <label>1. 선생님 선택</label>
-    <div id="teacherBox" class="grid mt8"></div>
-    <label class="mt16" style="display:block">2. 학생 선택</label>
-    <div id="studentBox" class="grid mt8"></div>
-  </div>
-
-  <div class="card mt16">
-    <label>3. 문구 및 수신설정</label>
-    <div class="templates mt8" id="tpls"></div>
-    
-    <div class="mt16">
-      <label>수신 대상</label>
-      <div class="templates mt8">
-        <span class="pill on" data-to="parent">학부모</span>
-        <span class="pill" data-to="student">학생</span>
-        <span class="pill" data-to="custom">직접입력</span>
-      </div>
-      <input id="customTo" class="mt8" placeholder="01012345678" style="display:none">
-      <div class="mt8" style="font-size:13px">수신번호: <b id="toPreview">-</b></div>
-    </div>
-
-    <div class="mt16">
-      <label>문자 내용 (수정 가능)</label>
-      <textarea id="text"></textarea>
-    </div>
-
-    <div class="actionbar">
-      <button id="send" class="primary">전송하기</button>
-      <label class="inlinecheck"><input type="checkbox" id="dry"> <span class="muted">Dry-run (테스트)</span></label>
-      <span id="status" class="status"></span>
-    </div>
-
-    <div class="mt16">
-      <label>로그</label>
-      <pre id="out">결과가 여기에 표시됩니다.</pre>
-    </div>
-  </div>
-</div>
-
-<script>
-const ROSTER = {
-  "장호민": [
-    {"id": "장호민::박재연", "name": "박재연", "parentPhone": "01056399340", "studentPhone": ""},
-    {"id": "장호민::신지은", "name": "신지은", "parentPhone": "01029669172", "studentPhone": ""},
-    {"id": "장호민::심지용", "name": "심지용", "parentPhone": "01095158734", "studentPhone": "01095148734"},
-    {"id": "장호민::최성윤", "name": "최성윤", "parentPhone": "01083236376", "studentPhone": "01054846376"},
-    {"id": "장호민::신유찬", "name": "신유찬", "parentPhone": "01023758586", "studentPhone": ""},
-    {"id": "장호민::박재율", "name": "박재율", "parentPhone": "01041594266", "studentPhone": "01050224156"},
-    {"id": "장호민::남윤아", "name": "남윤아", "parentPhone": "01098916957", "studentPhone": ""},
-    {"id": "장호민::이준홍", "name": "이준홍", "parentPhone": "01045675711", "studentPhone": "01062933364"},
-    {"id": "장호민::정찬", "name": "정찬", "parentPhone": "01051050952", "studentPhone": "01059290952"},
-    {"id": "장호민::탁예린", "name": "탁예린", "parentPhone": "01038946463", "studentPhone": "01053816463"},
-    {"id": "장호민::탁율", "name": "탁율", "parentPhone": "01038946463", "studentPhone": "01047756463"},
-    {"id": "장호민::이다은", "name": "이다은", "parentPhone": "01090232909", "studentPhone": "01090382909"},
-    {"id": "장호민::신승현", "name": "신승현", "parentPhone": "01045340302", "studentPhone": "01027390302"},
-    {"id": "장호민::허다희", "name": "허다희", "parentPhone": "01034413292", "studentPhone": "01021243292"},
-    {"id": "장호민::최승리", "name": "최승리", "parentPhone": "01056715781", "studentPhone": "01036055781"},
-    {"id": "장호민::이정원", "name": "이정원", "parentPhone": "01080087122", "studentPhone": "01055408535"},
-    {"id": "장호민::정윤슬", "name": "정윤슬", "parentPhone": "01051050952", "studentPhone": ""},
-    {"id": "장호민::김리우", "name": "김리우", "parentPhone": "01077214721", "studentPhone": ""},
-    {"id": "장호민::최설아", "name": "최설아", "parentPhone": "01037686015", "studentPhone": ""},
-    {"id": "장호민::전태식", "name": "전태식", "parentPhone": "01066073353", "studentPhone": ""},
-    {"id": "장호민::박하은", "name": "박하은", "parentPhone": "01043084759", "studentPhone": ""},
-    {"id": "장호민::김민균", "name": "김민균", "parentPhone": "01055068033", "studentPhone": ""},
-    {"id": "장호민::박서윤", "name": "박서윤", "parentPhone": "01065333681", "studentPhone": ""},
-    {"id": "장호민::전아인", "name": "전아인", "parentPhone": "01040040318", "studentPhone": ""},
-    {"id": "장호민::이현은", "name": "이현은", "parentPhone": "01062651516", "studentPhone": ""},
-    {"id": "장호민::옥범준", "name": "옥범준", "parentPhone": "01096733240", "studentPhone": ""},
-    {"id": "장호민::오지연", "name": "오지연", "parentPhone": "01044192557", "studentPhone": ""},
-    {"id": "장호민::김도원", "name": "김도원", "parentPhone": "01033386763", "studentPhone": ""},
-    {"id": "장호민::권은유", "name": "권은유", "parentPhone": "01094115087", "studentPhone": ""},
-    {"id": "장호민::강현준", "name": "강현준", "parentPhone": "01075672641", "studentPhone": ""},
-    {"id": "장호민::이준근", "name": "이준근", "parentPhone": "01066245875", "studentPhone": ""},
-    {"id": "장호민::이서윤", "name": "이서윤", "parentPhone": "01023552566", "studentPhone": ""},
-    {"id": "장호민::이건우", "name": "이건우", "parentPhone": "01030698339", "studentPhone": ""},
-    {"id": "장호민::김도연", "name": "김도연", "parentPhone": "01033386763", "studentPhone": ""},
-    {"id": "장호민::정민우", "name": "정민우", "parentPhone": "01050531629", "studentPhone": ""},
-    {"id": "장호민::고결", "name": "고결", "parentPhone": "01036179299", "studentPhone": ""},
-  ],
-  "이헌철": [
-    {"id": "이헌철::장유진", "name": "장유진", "parentPhone": "", "studentPhone": ""},
-    {"id": "이헌철::서범대", "name": "서범대", "parentPhone": "01040689887", "studentPhone": ""},
-    {"id": "이헌철::이채민", "name": "이채민", "parentPhone": "01031007214", "studentPhone": ""},
-    {"id": "이헌철::배소은", "name": "배소은", "parentPhone": "01093604868", "studentPhone": ""},
-    {"id": "이헌철::한가영", "name": "한가영", "parentPhone": "01088516940", "studentPhone": "01031096940"},
-    {"id": "이헌철::박재윤", "name": "박재윤", "parentPhone": "01071176951", "studentPhone": ""},
-    {"id": "이헌철::안서진", "name": "안서진", "parentPhone": "01062283304", "studentPhone": ""},
-    {"id": "이헌철::심영탁", "name": "심영탁", "parentPhone": "01062329147", "studentPhone": ""},
-    {"id": "이헌철::고현민", "name": "고현민", "parentPhone": "01062352672", "studentPhone": "01029662835"},
-    {"id": "이헌철::차은호", "name": "차은호", "parentPhone": "01095790135", "studentPhone": "01094003148"},
-    {"id": "이헌철::최형준", "name": "최형준", "parentPhone": "01076517704", "studentPhone": ""},
-    {"id": "이헌철::임창빈", "name": "임창빈", "parentPhone": "01041227964", "studentPhone": ""},
-    {"id": "이헌철::박준형", "name": "박준형", "parentPhone": "01053752902", "studentPhone": ""},
-    {"id": "이헌철::최윤겸", "name": "최윤겸", "parentPhone": "01020932459", "studentPhone": ""},
-    {"id": "이헌철::김온유", "name": "김온유", "parentPhone": "01030333232", "studentPhone": ""},
-    {"id": "이헌철::김건우", "name": "김건우", "parentPhone": "01090952844", "studentPhone": ""},
-    {"id": "이헌철::조석현", "name": "조석현", "parentPhone": "01025104035", "studentPhone": ""},
-    {"id": "이헌철::봉유근", "name": "봉유근", "parentPhone": "01043377107", "studentPhone": ""},
-    {"id": "이헌철::윤서영", "name": "윤서영", "parentPhone": "01072093663", "studentPhone": ""},
-    {"id": "이헌철::고준서", "name": "고준서", "parentPhone": "01097905478", "studentPhone": ""},
-    {"id": "이헌철::곽민서", "name": "곽민서", "parentPhone": "01044746152", "studentPhone": ""},
-    {"id": "이헌철::백소율", "name": "백소율", "parentPhone": "01099537571", "studentPhone": ""},
-    {"id": "이헌철::신은재", "name": "신은재", "parentPhone": "01073810826", "studentPhone": ""},
-    {"id": "이헌철::연정흠", "name": "연정흠", "parentPhone": "01054595704", "studentPhone": ""},
-    {"id": "이헌철::유강민", "name": "유강민", "parentPhone": "01089309296", "studentPhone": ""},
-    {"id": "이헌철::남이준", "name": "남이준", "parentPhone": "01049477172", "studentPhone": ""},
-    {"id": "이헌철::이현", "name": "이현", "parentPhone": "01083448867", "studentPhone": ""},
-    {"id": "이헌철::정유진", "name": "정유진", "parentPhone": "01033898056", "studentPhone": ""},
-    {"id": "이헌철::전찬식", "name": "전찬식", "parentPhone": "01066073353", "studentPhone": ""},
-    {"id": "이헌철::김주환", "name": "김주환", "parentPhone": "01037602796", "studentPhone": ""},
-    {"id": "이헌철::김수현", "name": "김수현", "parentPhone": "01034667951", "studentPhone": ""},
-    {"id": "이헌철::김도현", "name": "김도현", "parentPhone": "01044087732", "studentPhone": ""},
-    {"id": "이헌철::이유근", "name": "이유근", "parentPhone": "01027106068", "studentPhone": ""},
-    {"id": "이헌철::장민경", "name": "장민경", "parentPhone": "01066741973", "studentPhone": ""},
-    {"id": "이헌철::김기범", "name": "김기범", "parentPhone": "01051881350", "studentPhone": ""},
-    {"id": "이헌철::송유담", "name": "송유담", "parentPhone": "01093940117", "studentPhone": ""},
-    {"id": "이헌철::장민아", "name": "장민아", "parentPhone": "01049404508", "studentPhone": ""},
-    {"id": "이헌철::정혜인", "name": "정혜인", "parentPhone": "01088457421", "studentPhone": ""},
-  ],
-  "최윤영": [
-    {"id": "최윤영::안유진", "name": "안유진", "parentPhone": "01039113947", "studentPhone": ""},
-    {"id": "최윤영::김류은", "name": "김류은", "parentPhone": "01049370692", "studentPhone": "01064880692"},
-    {"id": "최윤영::진세헌", "name": "진세헌", "parentPhone": "01094233540", "studentPhone": "01093917471"},
-    {"id": "최윤영::서동욱", "name": "서동욱", "parentPhone": "01089197997", "studentPhone": ""},
-    {"id": "최윤영::기도윤", "name": "기도윤", "parentPhone": "01047612937", "studentPhone": "01057172937"},
-    {"id": "최윤영::황세빈", "name": "황세빈", "parentPhone": "01029340929", "studentPhone": ""},
-    {"id": "최윤영::최시원", "name": "최시원", "parentPhone": "01091925924", "studentPhone": ""},
-    {"id": "최윤영::이동현", "name": "이동현", "parentPhone": "01095905486", "studentPhone": ""},
-    {"id": "최윤영::이소영", "name": "이소영", "parentPhone": "01080253405", "studentPhone": ""},
-    {"id": "최윤영::최현서", "name": "최현서", "parentPhone": "01026618590", "studentPhone": ""},
-    {"id": "최윤영::신유나", "name": "신유나", "parentPhone": "01099245907", "studentPhone": ""},
-    {"id": "최윤영::신유찬", "name": "신유찬", "parentPhone": "01099245907", "studentPhone": ""},
-    {"id": "최윤영::노유종", "name": "노유종", "parentPhone": "01047626707", "studentPhone": ""},
-    {"id": "최윤영::정다율", "name": "정다율", "parentPhone": "01050531629", "studentPhone": ""},
-    {"id": "최윤영::최성현", "name": "최성현", "parentPhone": "01037465003", "studentPhone": ""},
-    {"id": "최윤영::유하엘", "name": "유하엘", "parentPhone": "01035796389", "studentPhone": ""},
-    {"id": "최윤영::이수빈", "name": "이수빈", "parentPhone": "01034725104", "studentPhone": "01088404945"},
-    {"id": "최윤영::김범준", "name": "김범준", "parentPhone": "01036297472", "studentPhone": ""},
-    {"id": "최윤영::김지환", "name": "김지환", "parentPhone": "01085822669", "studentPhone": ""},
-    {"id": "최윤영::김강휘", "name": "김강휘", "parentPhone": "01091263383", "studentPhone": ""},
-    {"id": "최윤영::이채은", "name": "이채은", "parentPhone": "01066394676", "studentPhone": ""},
-    {"id": "최윤영::하유찬", "name": "하유찬", "parentPhone": "01075571627", "studentPhone": ""},
-    {"id": "최윤영::안치현", "name": "안치현", "parentPhone": "01040227709", "studentPhone": ""},
-    {"id": "최윤영::이현범", "name": "이현범", "parentPhone": "01094312256", "studentPhone": ""},
-    {"id": "최윤영::현가비", "name": "현가비", "parentPhone": "01094083490", "studentPhone": ""},
-    {"id": "최윤영::정해수", "name": "정해수", "parentPhone": "01040782250", "studentPhone": ""},
-    {"id": "최윤영::안지우", "name": "안지우", "parentPhone": "01034323651", "studentPhone": ""},
-    {"id": "최윤영::범정우", "name": "범정우", "parentPhone": "01035988684", "studentPhone": ""}
-  ],
-  "황재선": [
-    {"id": "황재선::강나경", "name": "강나경", "parentPhone": "01036502963", "studentPhone": "01059322963"},
-    {"id": "황재선::변민경", "name": "변민경", "parentPhone": "01020067093", "studentPhone": "01079387093"},
-    {"id": "황재선::박정우", "name": "박정우", "parentPhone": "01077381679", "studentPhone": ""},
-    {"id": "황재선::안준혁", "name": "안준혁", "parentPhone": "01027459771", "studentPhone": ""},
-    {"id": "황재선::강이현", "name": "강이현", "parentPhone": "01030522547", "studentPhone": ""},
-    {"id": "황재선::장지후", "name": "장지후", "parentPhone": "01066741973", "studentPhone": ""},
-    {"id": "황재선::권민결", "name": "권민결", "parentPhone": "01045723566", "studentPhone": ""},
-    {"id": "황재선::임하준", "name": "임하준", "parentPhone": "01048557183", "studentPhone": ""},
-    {"id": "황재선::안치운", "name": "안치운", "parentPhone": "01027440458", "studentPhone": ""},
-    {"id": "황재선::김예준", "name": "김예준", "parentPhone": "01045876999", "studentPhone": ""},
-    {"id": "황재선::고하은", "name": "고하은", "parentPhone": "01036245135", "studentPhone": ""},
-    {"id": "황재선::신준화", "name": "신준화", "parentPhone": "01038382098", "studentPhone": ""},
-    {"id": "황재선::송유현", "name": "송유현", "parentPhone": "01088081413", "studentPhone": ""},
-    {"id": "황재선::이채영", "name": "이채영", "parentPhone": "01035201122", "studentPhone": ""}
-  ]
-};
-
-const TEMPLATES = [
-  { label:"등원 안내", text:"안녕하세요. 서울더함수학학원입니다. {given} 등원하였습니다." },
-  { label:"미등원 안내", text:"안녕하세요. 서울더함수학학원입니다. {given} 아직 등원 하지 않았습니다." },
-  { label:"조퇴 안내", text:"안녕하세요. 서울더함수학학원입니다. {given} 아파서 오늘 조퇴하였습니다. 아이 상태 확인해주세요." },
-  { label:"숙제 미제출", text:"안녕하세요. 서울더함수학학원입니다. {given} 오늘 과제 미제출입니다. 가정에서 점검 부탁드립니다." },
-  { label:"교재 공지", text:"안녕하세요. 서울더함수학학원입니다. {given} 새로운 교재 준비 부탁드립니다." }
-];
-
-const state = {
-  currentTeacher: "",
-  currentStudent: null,
-  currentTemplate: TEMPLATES[0], // 현재 선택된 템플릿 원본 저장
-  toType: "parent",
-  defaultFrom: ""
-};
-
-const $ = sel => document.querySelector(sel);
-const $$ = sel => Array.from(document.querySelectorAll(sel));
-
-function givenName(full) {
-  const s = String(full||"").trim();
-  if (!s) return "";
-  if (/^[가-힣]+$/.test(s) && s.length >= 2) return s.slice(1);
-  return s;
-}
-
-function applyText() {
-  const s = state.currentStudent;
-  if(!s || !state.currentTemplate) return;
-  // 템플릿 원본에서 {given}을 현재 학생의 이름으로 치환하여 textarea에 삽입
-  const processed = state.currentTemplate.text.replaceAll("{given}", givenName(s.name));
-  $("#text").value = processed;
-  updatePreview();
-}
-
-function updatePreview() {
-  const s = state.currentStudent;
-  let toNum = "";
-  if(state.toType === "parent") toNum = s?.parentPhone || "";
-  else if(state.toType === "student") toNum = s?.studentPhone || "";
-  else toNum = $("#customTo").value;
-  
-  $("#toPreview").textContent = toNum || "(번호 없음)";
-}
-
-function renderTeachers() {
-  const box = $("#teacherBox"); box.innerHTML = "";
-  Object.keys(ROSTER).forEach(t => {
-    const b = document.createElement("button");
-    b.className = "pill" + (t === state.currentTeacher ? " on" : "");
-    b.textContent = t;
-    b.onclick = () => {
-      state.currentTeacher = t;
-      state.currentStudent = ROSTER[t][0];
-      renderTeachers(); renderStudents(); applyText();
-    };
-    box.appendChild(b);
-  });
-}
-
-function renderStudents() {
-  const box = $("#studentBox"); box.innerHTML = "";
-  const list = ROSTER[state.currentTeacher] || [];
-  const q = $("#search").value.trim();
-  const filtered = q ? list.filter(s => s.name.includes(q)) : list;
-
-  filtered.forEach(s => {
-    const b = document.createElement("button");
-    b.className = "pill" + (state.currentStudent?.id === s.id ? " on" : "");
-    b.textContent = s.name;
-    b.onclick = () => {
-      state.currentStudent = s;
-      renderStudents(); applyText();
-    };
-    box.appendChild(b);
-  });
-}
+            r = solapi_post("/messages/v4/send", {"message": {"to": to, "from": from_num, "text": text}})
+        except requests.RequestException as e:
+            logger.warning("solapi send failed: %s", e)
+            return json_response({"ok": False, "error": "solapi-failed", "detail": str(e)}, 502)
+        body = r.content.strip()
+        if r.status_code < 300 and body[:1] + body[-1:] in (b"{}", b"[]") and "application/json" in r.headers.get("Content-Type", ""):
+            # 성공 응답은 파싱/재직렬화 없이 원문 JSON을 그대로 감싸서 전달
+            # (비었거나 잘렸거나 JSON 이 아닌 2xx 는 아래 upstream_body 로 — 이미 발송됐으니 깨진 JSON 을 주지 않도록)
+            return Response(SOLAPI_OK_PREFIX + body + b"}", status=r.status_code, mimetype="application/json")
+        return json_response({"ok": r.status_code < 300, "provider": "solapi", "response": upstream_body(r)}, r.status_code)
+
+    return json_response(dry_echo(to, from_num, text))
+
+def forward_one(m: dict) -> dict:
+    try:
+        r = SESSION.post(FORWARD_URL, data=json_dumps(m), timeout=(3, 15))
+        return {"to": m["to"], "ok": r.status_code < 300, "status": r.status_code}
+    except requests.RequestException as e:
+        logger.warning("forward send failed: %s", e)
+        return {"to": m["to"], "ok": False, "error": "forward-failed", "detail": str(e)}
+
+def bulk_forward(messages: list) -> list:
+    # FORWARD_URL은 단건 API라 메시지별 요청을 병렬로 보냄 (세션 풀 재사용)
+    futures = [EXECUTOR.submit(forward_one, m) for m in messages]
+    return [f.result() for f in futures]
+
+def send_many(messages: list) -> list:
+    # send-many: 메시지 수와 관계없이 서명 1회 + 요청 1회
+    # 형제가 같은 학부모 번호를 쓰는 경우가 있어 실패 건은 번호가 아니라 위치(customFields.idx)로 매칭
+    tagged = [{**m, "customFields": {"idx": str(i)}} for i, m in enumerate(messages)]
+    try:
+        r = solapi_post("/messages/v4/send-many/detail", {"messages": tagged})
+    except requests.RequestException as e:
+        logger.warning("solapi send-many (%d msgs) failed: %s", len(messages), e)
+        return [{"to": m["to"], "ok": False, "error": "solapi-failed", "detail": str(e)} for m in messages]
+    if r.status_code >= 300:
+        return [{"to": m["to"], "ok": False, "status": r.status_code} for m in messages]
+    data = upstream_body(r)
+    data = data if isinstance(data, dict) else {}
+    results = [{"to": m["to"], "ok": True} for m in messages]
+    counts = {}
+    for m in messages:
+        counts[m["to"]] = counts.get(m["to"], 0) + 1
+    positions = {m["to"]: i for i, m in enumerate(messages)}
+    for f in data.get("failedMessageList") or []:
+        error = f.get("statusMessage", "failed")
+        idx = str((f.get("customFields") or {}).get("idx", ""))
+        if idx.isdigit() and int(idx) < len(messages):
+            results[int(idx)] = {"to": messages[int(idx)]["to"], "ok": False, "error": error}
+        elif counts.get(f.get("to")) == 1:
+            results[positions[f["to"]]] = {"to": f["to"], "ok": False, "error": error}
+        else:
+            # 위치 없이 중복 번호로만 온 실패는 어느 건인지 알 수 없으므로 성공으로 보고하지 않음
+            for i, m in enumerate(messages):
+                if m["to"] == f.get("to") and results[i]["ok"]:
+                    results[i] = {"to": m["to"], "ok": None, "error": "unconfirmed", "detail": error}
+    return results
+
+def bulk_solapi(messages: list) -> list:
+    # 요청 본문이 커질수록 send-many 응답도 느려지므로 잘라서 병렬 전송
+    chunks = [messages[i:i + SOLAPI_BATCH_SIZE] for i in range(0, len(messages), SOLAPI_BATCH_SIZE)]
+    if len(chunks) <= 1:
+        return send_many(messages)
+    return [res for part in EXECUTOR.map(send_many, chunks) for res in part]
+
+def send_messages(messages: list, dry: bool = False):
+    if dry or PROVIDER == "mock":
+        return "mock", [{"to": m["to"], "ok": True, "dry": True, "len": len(m["text"])} for m in messages]
+    if PROVIDER == "forward":
+        return "forward", bulk_forward(messages)
+    return "solapi", bulk_solapi(messages)
+
+def place_results(results: list, positions: list, sent: list) -> list:
+    # 발송 결과를 입력 순서 자리에 채움 (거절 건은 이미 제자리에 있음), 원본 목록은 건드리지 않음
+    results = list(results)
+    for i, res in zip(positions, sent):
+        results[i] = {"index": i, **res}
+    return results
+
+@app.post("/api/sms/bulk")
+def sms_bulk():
+    ok, err = check_auth()
+    if not ok: return err
+    payload = read_payload(app.config["MAX_CONTENT_LENGTH"])
+    if payload is None:
+        return json_response({"ok": False, "error": "invalid json"}, 400)
+
+    items = payload.get("messages")
+    if not isinstance(items, list) or not items:
+        return json_response({"ok": False, "error": "missing messages"}, 400)
+    # 배치 상태를 워커 프로세스끼리 공유할 저장소가 없어 async(202 + 조회) 모드는 받지 않음
+    if payload.get("async"):
+        return json_response({"ok": False, "error": "async not supported"}, 400)
+    from_num = str_field(payload, "from") or DEFAULT_SENDER
+    dry = bool(payload.get("dry", False))
 
-async function send() {
-  const to = $("#toPreview").textContent.replace(/\D/g, "");
-  const text = $("#text").value.trim();
-  if(!to || !text) return alert("수신번호와 내용을 확인하세요.");
-
-  $("#status").textContent = "전송 중...";
-  try {
-    const res = await fetch("/api/sms", {
-      method: "POST",
-      headers: {"Content-Type": "application/json"},
-      body: JSON.stringify({to, text, from: state.defaultFrom, dry: $("#dry").checked})
-    });
-    const data = await res.json();
-    $("#out").textContent = JSON.stringify(data, null, 2);
-    $("#status").textContent = res.ok ? "성공" : "실패";
-  } catch(e) {
-    $("#status").textContent = "오류";
-  }
+    # 결과는 입력 순서 그대로, 각 항목에 입력 위치(index)를 붙여서 돌려줌
+    results, messages, positions = [None] * len(items), [], []
+    for i, item in enumerate(items):
+        item = item if isinstance(item, dict) else {}
+        to = str_field(item, "to")
+        text = str_field(item, "text")
+        if not to or not text:
+            results[i] = {"index": i, "to": to, "ok": False, "error": "missing to/text"}
+            continue
+        if not PHONE_RE.match(to):
+            results[i] = {"index": i, "to": to, "ok": False, "error": "invalid phone"}
+            continue
+        messages.append({"to": to, "from": str_field(item, "from") or from_num, "text": text})
+        positions.append(i)
+
+    provider, sent = send_messages(messages, dry)
+    results = place_results(results, positions, sent)
+    logger.info("bulk send: %d msgs via %s, %d rejected", len(messages), provider, len(items) - len(messages))
+
+    return json_response({"ok": all(r["ok"] for r in results), "provider": provider, "results": results})
+
+# 선생님별 학생 명단 — UI 는 /api/roster 로 따로 받아감 (HTML 과 별도로 캐시/재검증)
+ROSTER = {
+    "장호민": [
+        {"id": "장호민::박재연", "name": "박재연", "parentPhone": "01056399340", "studentPhone": ""},
+        {"id": "장호민::신지은", "name": "신지은", "parentPhone": "01029669172", "studentPhone": ""},
+        {"id": "장호민::심지용", "name": "심지용", "parentPhone": "01095158734", "studentPhone": "01095148734"},
+        {"id": "장호민::최성윤", "name": "최성윤", "parentPhone": "01083236376", "studentPhone": "01054846376"},
+        {"id": "장호민::신유찬", "name": "신유찬", "parentPhone": "01023758586", "studentPhone": ""},
+        {"id": "장호민::박재율", "name": "박재율", "parentPhone": "01041594266", "studentPhone": "01050224156"},
+        {"id": "장호민::남윤아", "name": "남윤아", "parentPhone": "01098916957", "studentPhone": ""},
+        {"id": "장호민::이준홍", "name": "이준홍", "parentPhone": "01045675711", "studentPhone": "01062933364"},
+        {"id": "장호민::정찬", "name": "정찬", "parentPhone": "01051050952", "studentPhone": "01059290952"},
+        {"id": "장호민::탁예린", "name": "탁예린", "parentPhone": "01038946463", "studentPhone": "01053816463"},
+        {"id": "장호민::탁율", "name": "탁율", "parentPhone": "01038946463", "studentPhone": "01047756463"},
+        {"id": "장호민::이다은", "name": "이다은", "parentPhone": "01090232909", "studentPhone": "01090382909"},
+        {"id": "장호민::신승현", "name": "신승현", "parentPhone": "01045340302", "studentPhone": "01027390302"},
+        {"id": "장호민::허다희", "name": "허다희", "parentPhone": "01034413292", "studentPhone": "01021243292"},
+        {"id": "장호민::최승리", "name": "최승리", "parentPhone": "01056715781", "studentPhone": "01036055781"},
+        {"id": "장호민::이정원", "name": "이정원", "parentPhone": "01080087122", "studentPhone": "01055408535"},
+        {"id": "장호민::정윤슬", "name": "정윤슬", "parentPhone": "01051050952", "studentPhone": ""},
+        {"id": "장호민::김리우", "name": "김리우", "parentPhone": "01077214721", "studentPhone": ""},
+        {"id": "장호민::최설아", "name": "최설아", "parentPhone": "01037686015", "studentPhone": ""},
+        {"id": "장호민::전태식", "name": "전태식", "parentPhone": "01066073353", "studentPhone": ""},
+        {"id": "장호민::박하은", "name": "박하은", "parentPhone": "01043084759", "studentPhone": ""},
+        {"id": "장호민::김민균", "name": "김민균", "parentPhone": "01055068033", "studentPhone": ""},
+        {"id": "장호민::박서윤", "name": "박서윤", "parentPhone": "01065333681", "studentPhone": ""},
+        {"id": "장호민::전아인", "name": "전아인", "parentPhone": "01040040318", "studentPhone": ""},
+        {"id": "장호민::이현은", "name": "이현은", "parentPhone": "01062651516", "studentPhone": ""},
+        {"id": "장호민::옥범준", "name": "옥범준", "parentPhone": "01096733240", "studentPhone": ""},
+        {"id": "장호민::오지연", "name": "오지연", "parentPhone": "01044192557", "studentPhone": ""},
+        {"id": "장호민::김도원", "name": "김도원", "parentPhone": "01033386763", "studentPhone": ""},
+        {"id": "장호민::권은유", "name": "권은유", "parentPhone": "01094115087", "studentPhone": ""},
+        {"id": "장호민::강현준", "name": "강현준", "parentPhone": "01075672641", "studentPhone": ""},
+        {"id": "장호민::이준근", "name": "이준근", "parentPhone": "01066245875", "studentPhone": ""},
+        {"id": "장호민::이서윤", "name": "이서윤", "parentPhone": "01023552566", "studentPhone": ""},
+        {"id": "장호민::이건우", "name": "이건우", "parentPhone": "01030698339", "studentPhone": ""},
+        {"id": "장호민::김도연", "name": "김도연", "parentPhone": "01033386763", "studentPhone": ""},
+        {"id": "장호민::정민우", "name": "정민우", "parentPhone": "01050531629", "studentPhone": ""},
+        {"id": "장호민::고결", "name": "고결", "parentPhone": "01036179299", "studentPhone": ""},
+    ],
+    "이헌철": [
+        {"id": "이헌철::장유진", "name": "장유진", "parentPhone": "", "studentPhone": ""},
+        {"id": "이헌철::서범대", "name": "서범대", "parentPhone": "01040689887", "studentPhone": ""},
+        {"id": "이헌철::이채민", "name": "이채민", "parentPhone": "01031007214", "studentPhone": ""},
+        {"id": "이헌철::배소은", "name": "배소은", "parentPhone": "01093604868", "studentPhone": ""},
+        {"id": "이헌철::한가영", "name": "한가영", "parentPhone": "01088516940", "studentPhone": "01031096940"},
+        {"id": "이헌철::박재윤", "name": "박재윤", "parentPhone": "01071176951", "studentPhone": ""},
+        {"id": "이헌철::안서진", "name": "안서진", "parentPhone": "01062283304", "studentPhone": ""},
+        {"id": "이헌철::심영탁", "name": "심영탁", "parentPhone": "01062329147", "studentPhone": ""},
+        {"id": "이헌철::고현민", "name": "고현민", "parentPhone": "01062352672", "studentPhone": "01029662835"},
+        {"id": "이헌철::차은호", "name": "차은호", "parentPhone": "01095790135", "studentPhone": "01094003148"},
+        {"id": "이헌철::최형준", "name": "최형준", "parentPhone": "01076517704", "studentPhone": ""},
+        {"id": "이헌철::임창빈", "name": "임창빈", "parentPhone": "01041227964", "studentPhone": ""},
+        {"id": "이헌철::박준형", "name": "박준형", "parentPhone": "01053752902", "studentPhone": ""},
+        {"id": "이헌철::최윤겸", "name": "최윤겸", "parentPhone": "01020932459", "studentPhone": ""},
+        {"id": "이헌철::김온유", "name": "김온유", "parentPhone": "01030333232", "studentPhone": ""},
+        {"id": "이헌철::김건우", "name": "김건우", "parentPhone": "01090952844", "studentPhone": ""},
+        {"id": "이헌철::조석현", "name": "조석현", "parentPhone": "01025104035", "studentPhone": ""},
+        {"id": "이헌철::봉유근", "name": "봉유근", "parentPhone": "01043377107", "studentPhone": ""},
+        {"id": "이헌철::윤서영", "name": "윤서영", "parentPhone": "01072093663", "studentPhone": ""},
+        {"id": "이헌철::고준서", "name": "고준서", "parentPhone": "01097905478", "studentPhone": ""},
+        {"id": "이헌철::곽민서", "name": "곽민서", "parentPhone": "01044746152", "studentPhone": ""},
+        {"id": "이헌철::백소율", "name": "백소율", "parentPhone": "01099537571", "studentPhone": ""},
+        {"id": "이헌철::신은재", "name": "신은재", "parentPhone": "01073810826", "studentPhone": ""},
+        {"id": "이헌철::연정흠", "name": "연정흠", "parentPhone": "01054595704", "studentPhone": ""},
+        {"id": "이헌철::유강민", "name": "유강민", "parentPhone": "01089309296", "studentPhone": ""},
+        {"id": "이헌철::남이준", "name": "남이준", "parentPhone": "01049477172", "studentPhone": ""},
+        {"id": "이헌철::이현", "name": "이현", "parentPhone": "01083448867", "studentPhone": ""},
+        {"id": "이헌철::정유진", "name": "정유진", "parentPhone": "01033898056", "studentPhone": ""},
+        {"id": "이헌철::전찬식", "name": "전찬식", "parentPhone": "01066073353", "studentPhone": ""},
+        {"id": "이헌철::김주환", "name": "김주환", "parentPhone": "01037602796", "studentPhone": ""},
+        {"id": "이헌철::김수현", "name": "김수현", "parentPhone": "01034667951", "studentPhone": ""},
+        {"id": "이헌철::김도현", "name": "김도현", "parentPhone": "01044087732", "studentPhone": ""},
+        {"id": "이헌철::이유근", "name": "이유근", "parentPhone": "01027106068", "studentPhone": ""},
+        {"id": "이헌철::장민경", "name": "장민경", "parentPhone": "01066741973", "studentPhone": ""},
+        {"id": "이헌철::김기범", "name": "김기범", "parentPhone": "01051881350", "studentPhone": ""},
+        {"id": "이헌철::송유담", "name": "송유담", "parentPhone": "01093940117", "studentPhone": ""},
+        {"id": "이헌철::장민아", "name": "장민아", "parentPhone": "01049404508", "studentPhone": ""},
+        {"id": "이헌철::정혜인", "name": "정혜인", "parentPhone": "01088457421", "studentPhone": ""},
+    ],
+    "최윤영": [
+        {"id": "최윤영::안유진", "name": "안유진", "parentPhone": "01039113947", "studentPhone": ""},
+        {"id": "최윤영::김류은", "name": "김류은", "parentPhone": "01049370692", "studentPhone": "01064880692"},
+        {"id": "최윤영::진세헌", "name": "진세헌", "parentPhone": "01094233540", "studentPhone": "01093917471"},
+        {"id": "최윤영::서동욱", "name": "서동욱", "parentPhone": "01089197997", "studentPhone": ""},
+        {"id": "최윤영::기도윤", "name": "기도윤", "parentPhone": "01047612937", "studentPhone": "01057172937"},
+        {"id": "최윤영::황세빈", "name": "황세빈", "parentPhone": "01029340929", "studentPhone": ""},
+        {"id": "최윤영::최시원", "name": "최시원", "parentPhone": "01091925924", "studentPhone": ""},
+        {"id": "최윤영::이동현", "name": "이동현", "parentPhone": "01095905486", "studentPhone": ""},
+        {"id": "최윤영::이소영", "name": "이소영", "parentPhone": "01080253405", "studentPhone": ""},
+        {"id": "최윤영::최현서", "name": "최현서", "parentPhone": "01026618590", "studentPhone": ""},
+        {"id": "최윤영::신유나", "name": "신유나", "parentPhone": "01099245907", "studentPhone": ""},
+        {"id": "최윤영::신유찬", "name": "신유찬", "parentPhone": "01099245907", "studentPhone": ""},
+        {"id": "최윤영::노유종", "name": "노유종", "parentPhone": "01047626707", "studentPhone": ""},
+        {"id": "최윤영::정다율", "name": "정다율", "parentPhone": "01050531629", "studentPhone": ""},
+        {"id": "최윤영::최성현", "name": "최성현", "parentPhone": "01037465003", "studentPhone": ""},
+        {"id": "최윤영::유하엘", "name": "유하엘", "parentPhone": "01035796389", "studentPhone": ""},
+        {"id": "최윤영::이수빈", "name": "이수빈", "parentPhone": "01034725104", "studentPhone": "01088404945"},
+        {"id": "최윤영::김범준", "name": "김범준", "parentPhone": "01036297472", "studentPhone": ""},
+        {"id": "최윤영::김지환", "name": "김지환", "parentPhone": "01085822669", "studentPhone": ""},
+        {"id": "최윤영::김강휘", "name": "김강휘", "parentPhone": "01091263383", "studentPhone": ""},
+        {"id": "최윤영::이채은", "name": "이채은", "parentPhone": "01066394676", "studentPhone": ""},
+        {"id": "최윤영::하유찬", "name": "하유찬", "parentPhone": "01075571627", "studentPhone": ""},
+        {"id": "최윤영::안치현", "name": "안치현", "parentPhone": "01040227709", "studentPhone": ""},
+        {"id": "최윤영::이현범", "name": "이현범", "parentPhone": "01094312256", "studentPhone": ""},
+        {"id": "최윤영::현가비", "name": "현가비", "parentPhone": "01094083490", "studentPhone": ""},
+        {"id": "최윤영::정해수", "name": "정해수", "parentPhone": "01040782250", "studentPhone": ""},
+        {"id": "최윤영::안지우", "name": "안지우", "parentPhone": "01034323651", "studentPhone": ""},
+        {"id": "최윤영::범정우", "name": "범정우", "parentPhone": "01035988684", "studentPhone": ""}
+    ],
+    "황재선": [
+        {"id": "황재선::강나경", "name": "강나경", "parentPhone": "01036502963", "studentPhone": "01059322963"},
+        {"id": "황재선::변민경", "name": "변민경", "parentPhone": "01020067093", "studentPhone": "01079387093"},
+        {"id": "황재선::박정우", "name": "박정우", "parentPhone": "01077381679", "studentPhone": ""},
+        {"id": "황재선::안준혁", "name": "안준혁", "parentPhone": "01027459771", "studentPhone": ""},
+        {"id": "황재선::강이현", "name": "강이현", "parentPhone": "01030522547", "studentPhone": ""},
+        {"id": "황재선::장지후", "name": "장지후", "parentPhone": "01066741973", "studentPhone": ""},
+        {"id": "황재선::권민결", "name": "권민결", "parentPhone": "01045723566", "studentPhone": ""},
+        {"id": "황재선::임하준", "name": "임하준", "parentPhone": "01048557183", "studentPhone": ""},
+        {"id": "황재선::안치운", "name": "안치운", "parentPhone": "01027440458", "studentPhone": ""},
+        {"id": "황재선::김예준", "name": "김예준", "parentPhone": "01045876999", "studentPhone": ""},
+        {"id": "황재선::고하은", "name": "고하은", "parentPhone": "01036245135", "studentPhone": ""},
+        {"id": "황재선::신준화", "name": "신준화", "parentPhone": "01038382098", "studentPhone": ""},
+        {"id": "황재선::송유현", "name": "송유현", "parentPhone": "01088081413", "studentPhone": ""},
+        {"id": "황재선::이채영", "name": "이채영", "parentPhone": "01035201122", "studentPhone": ""}
+    ]
 }
 
-// 초기화
-(async () => {
-  try {
-    const res = await fetch("/api/sms/config");
-    const cfg = await res.json();
-    state.defaultFrom = cfg.defaultFrom;
-    $("#fromNum").value = cfg.defaultFrom;
-  } catch(e) {}
-
-  // 템플릿 버튼 생성
-  const tplBox = $("#tpls");
-  TEMPLATES.forEach((t, idx) => {
-    const b = document.createElement("button");
-    b.className = "pill" + (idx === 0 ? " on" : "");
-    b.textContent = t.label;
-    b.onclick = () => {
-      $$("#tpls .pill").forEach(btn => btn.classList.remove("on"));
-      b.classList.add("on");
-      state.currentTemplate = t;
-      applyText();
-    };
-    tplBox.appendChild(b);
-  });
-
-  // 수신대상 버튼 이벤트
-  $$("[data-to]").forEach(btn => {
-    btn.onclick = () => {
-      $$("[data-to]").forEach(b => b.classList.remove("on"));
-      btn.classList.add("on");
-      state.toType = btn.dataset.to;
-      $("#customTo").style.display = state.toType === "custom" ? "block" : "none";
-      updatePreview();
-    };
-  });
-
-  state.currentTeacher = Object.keys(ROSTER)[0];
-  state.currentStudent = ROSTER[state.currentTeacher][0];
-  
-  renderTeachers(); renderStudents(); applyText();
-
-  $("#search").oninput = renderStudents;
-  $("#customTo").oninput = updatePreview;
-  $("#send").onclick = send;
-})();
-</script>
-</body></html>
-"""
+# UI는 기동 후 바뀌지 않으므로 인코딩/압축/ETag를 한 번만 계산
+ENCODINGS = ["br", "gzip"] if brotli else ["gzip"]  # 품질이 같으면 앞쪽(br) 우선
+
+def precompressed(body: bytes) -> dict:
+    # 기동 시 한 번만 압축 → 요청마다는 고르기만
+    encoded = {"gzip": gzip.compress(body, 9, mtime=0)}
+    if brotli: encoded["br"] = brotli.compress(body, quality=11)
+    return encoded
+
+def static_response(body: bytes, encoded: dict, etag: str, content_type: str, max_age: int = 0, private: bool = False) -> Response:
+    enc = request.accept_encodings.best_match(ENCODINGS)
+    resp = Response(encoded[enc] if enc else body, content_type=content_type)
+    if enc: resp.headers["Content-Encoding"] = enc
+    resp.vary.add("Accept-Encoding")
+    resp.set_etag(f"{etag}-{enc}" if enc else etag)
+    if max_age:
+        # 내용 해시가 URL(?v=)에 들어간 자원만 — 바뀌면 URL 이 바뀌므로 재검증 불필요
+        resp.cache_control.public = True
+        resp.cache_control.max_age = max_age
+        resp.cache_control.immutable = True
+    else:
+        # 명단/템플릿은 배포로만 바뀌므로 max-age 대신 매번 ETag로 재검증 (배포 직후 바로 반영)
+        resp.cache_control.no_cache = True
+    if private: resp.cache_control.private = True  # no-cache 만으로는 공유 캐시(프록시/CDN)가 저장할 수 있음
+    return resp.make_conditional(request)
+
+def read_asset(name: str) -> bytes:
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), name), "rb") as f:
+        return f.read()
+
+# 화면은 옆의 ui.html + ui.js — 바이트 그대로 읽어서 압축본/ETag 만 미리 만들어 둠
+APP_JS_BYTES   = read_asset("ui.js")
+APP_JS_ETAG    = hashlib.sha256(APP_JS_BYTES).hexdigest()[:16]
+APP_JS_ENCODED = precompressed(APP_JS_BYTES)
+
+# 스크립트 URL 에 내용 해시를 넣어 JS 는 오래 캐시하고, 바뀌면 HTML 이 새 URL 을 가리킴
+UI_BYTES   = read_asset("ui.html").replace(b"__APP_JS_VERSION__", APP_JS_ETAG.encode("ascii"))
+UI_ETAG    = hashlib.sha256(UI_BYTES).hexdigest()[:16]
+UI_ENCODED = precompressed(UI_BYTES)
+
+ROSTER_BODY    = json_dumps(ROSTER)
+ROSTER_ETAG    = hashlib.sha256(ROSTER_BODY).hexdigest()[:16]
+ROSTER_ENCODED = precompressed(ROSTER_BODY)
 
 @app.get("/ui")
 def ui():
-    return Response(WEB_UI_HTML, mimetype="text/html; charset=utf-8")
+    return static_response(UI_BYTES, UI_ENCODED, UI_ETAG, "text/html; charset=utf-8")
+
+@app.get("/ui/app.js")
+def ui_app_js():
+    # 이 인스턴스의 내용 해시와 ?v= 가 같을 때만 immutable — 롤링 배포 중 구 인스턴스가 새 해시 URL 에
+    # 옛 JS 를 1년짜리로 박아 넣지 않도록, 그 외에는 /ui 처럼 no-cache + ETag
+    max_age = 31536000 if request.args.get("v") == APP_JS_ETAG else 0
+    return static_response(APP_JS_BYTES, APP_JS_ENCODED, APP_JS_ETAG, "text/javascript; charset=utf-8", max_age=max_age)
+
+@app.get("/api/roster")
+def roster():
+    # 학부모 전화번호가 들어 있으므로 브라우저에만 캐시
+    return static_response(ROSTER_BODY, ROSTER_ENCODED, ROSTER_ETAG, "application/json", private=True)
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", "10000"))
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import os, sys, json, unittest
+from unittest import mock
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import nurigo_server_fixed as server
+
+def post_chunked(path: str, body: bytes):
+    # gunicorn 처럼 Content-Length 없이 Transfer-Encoding: chunked + wsgi.input_terminated 로 전달
+    environ = EnvironBuilder(path=path, method="POST", data=body, content_type="application/json").get_environ()
+    environ.pop("CONTENT_LENGTH", None)
+    environ["HTTP_TRANSFER_ENCODING"] = "chunked"
+    environ["wsgi.input_terminated"] = True
+    app_iter, status, headers = run_wsgi_app(server.app.wsgi_app, environ)
+    return int(status.split()[0]), json.loads(b"".join(app_iter))
+
+def padded(payload: dict, size: int) -> bytes:
+    # 유효한 JSON 뒤를 공백으로 채워 정확히 size 바이트로
+    raw = json.dumps(payload).encode("utf-8")
+    return raw + b" " * (size - len(raw))
+
+class ChunkedBodyLimitTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(server, "PROVIDER", "mock")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_sms_under_limit_is_accepted(self):
+        # 이스케이프된 한글 LMS(1000자, 약 6KB)도 들어가야 함
+        body = json.dumps({"to": "01012345678", "text": "가" * 1000, "dry": True}).encode("ascii")
+        status, data = post_chunked("/api/sms", body)
+        self.assertEqual(status, 200)
+        self.assertEqual(data["echo"]["len"], 1000)
+
+    def test_sms_at_limit_is_accepted(self):
+        status, data = post_chunked("/api/sms", padded({"to": "01012345678", "text": "hi", "dry": True}, server.SMS_MAX_BYTES))
+        self.assertEqual(status, 200)
+        self.assertTrue(data["ok"])
+
+    def test_sms_over_limit_is_413(self):
+        status, data = post_chunked("/api/sms", padded({"to": "01012345678", "text": "hi", "dry": True}, server.SMS_MAX_BYTES + 1))
+        self.assertEqual(status, 413)
+        self.assertEqual(data["error"], "too-large")
+
+    def test_bulk_under_limit_is_accepted(self):
+        messages = [{"to": "01012345678", "text": "가" * 100}] * 50
+        status, data = post_chunked("/api/sms/bulk", json.dumps({"messages": messages, "dry": True}).encode("utf-8"))
+        self.assertEqual(status, 200)
+        self.assertEqual(len(data["results"]), 50)
+
+    def test_bulk_over_limit_is_413(self):
+        limit = server.app.config["MAX_CONTENT_LENGTH"]
+        status, data = post_chunked("/api/sms/bulk", padded({"messages": [{"to": "01012345678", "text": "hi"}], "dry": True}, limit + 1))
+        self.assertEqual(status, 413)
+        self.assertEqual(data["error"], "too-large")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import os, sys, json, threading, unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SOLAPI_KEY", "test-key")
+os.environ.setdefault("SOLAPI_SECRET", "test-secret")
+import nurigo_server_fixed as server
+
+class FakeResponse:
+    def __init__(self, body: dict, status: int = 200):
+        self.status_code = status
+        self.content = json.dumps(body).encode("utf-8")
+        self.text = self.content.decode("utf-8")
+        self.headers = {"Content-Type": "application/json"}
+
+    def close(self):
+        pass
+
+class FakeSolapi:
+    """send-many/detail 스텁: fail(messages) 가 돌려준 항목을 failedMessageList 로 응답."""
+
+    def __init__(self, fail=lambda messages: []):
+        self.fail = fail
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, url, **kw):
+        messages = json.loads(kw["data"])["messages"]
+        with self.lock:
+            self.calls.append(messages)
+        return FakeResponse({"failedMessageList": self.fail(messages)})
+
+def failure(message: dict, with_idx: bool = True) -> dict:
+    entry = {"to": message["to"], "statusMessage": "rejected"}
+    if with_idx: entry["customFields"] = message["customFields"]
+    return entry
+
+class BulkTest(unittest.TestCase):
+    def setUp(self):
+        self.client = server.app.test_client()
+        patcher = mock.patch.object(server, "PROVIDER", "solapi")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, messages, **extra):
+        return self.client.post("/api/sms/bulk", json={"messages": messages, **extra})
+
+    def stub(self, fake):
+        patcher = mock.patch.object(server.SESSION, "post", fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return fake
+
+    def test_results_keep_input_order(self):
+        fake = self.stub(FakeSolapi())
+        r = self.post([
+            {"to": "01012345678", "text": "a"},
+            {"to": "x", "text": "b"},
+            "junk",
+            {"to": "01012345679", "text": "c"},
+        ])
+        results = r.get_json()["results"]
+        self.assertEqual([res["index"] for res in results], [0, 1, 2, 3])
+        self.assertEqual([res["ok"] for res in results], [True, False, False, True])
+        self.assertEqual(results[1]["error"], "invalid phone")
+        self.assertEqual(results[2]["error"], "missing to/text")
+        self.assertEqual([m["to"] for m in fake.calls[0]], ["01012345678", "01012345679"])
+
+    def test_failed_idx_marks_only_that_duplicate(self):
+        self.stub(FakeSolapi(lambda messages: [failure(messages[1])]))
+        r = self.post([{"to": "01038946463", "text": "a"}, {"to": "01038946463", "text": "b"}])
+        results = r.get_json()["results"]
+        self.assertEqual([res["ok"] for res in results], [True, False])
+        self.assertEqual(results[1]["error"], "rejected")
+
+    def test_failure_without_idx_falls_back_to_unique_phone(self):
+        self.stub(FakeSolapi(lambda messages: [failure(messages[2], with_idx=False)]))
+        r = self.post([
+            {"to": "01038946463", "text": "a"},
+            {"to": "01038946463", "text": "b"},
+            {"to": "01012345678", "text": "c"},
+        ])
+        self.assertEqual([res["ok"] for res in r.get_json()["results"]], [True, True, False])
+
+    def test_failure_without_idx_on_duplicate_phone_is_unconfirmed(self):
+        self.stub(FakeSolapi(lambda messages: [failure(messages[1], with_idx=False)]))
+        r = self.post([{"to": "01038946463", "text": "a"}, {"to": "01038946463", "text": "b"}])
+        results = r.get_json()["results"]
+        self.assertEqual([res["ok"] for res in results], [None, None])
+        self.assertEqual({res["error"] for res in results}, {"unconfirmed"})
+        self.assertFalse(r.get_json()["ok"])
+
+    def test_chunk_boundary_maps_idx_per_chunk(self):
+        # 두 번째 청크의 첫 메시지(idx 0)만 실패 → 전체 기준 501번째(index 500)만 실패
+        fake = self.stub(FakeSolapi(lambda messages: [failure(messages[0])] if len(messages) == 1 else []))
+        count = server.SOLAPI_BATCH_SIZE + 1
+        r = self.post([{"to": "0101234%04d" % i, "text": str(i)} for i in range(count)])
+        results = r.get_json()["results"]
+        self.assertEqual(sorted(len(c) for c in fake.calls), [1, server.SOLAPI_BATCH_SIZE])
+        self.assertEqual(len(results), count)
+        self.assertEqual([res["index"] for res in results], list(range(count)))
+        self.assertEqual([i for i, res in enumerate(results) if not res["ok"]], [server.SOLAPI_BATCH_SIZE])
+        self.assertEqual(results[server.SOLAPI_BATCH_SIZE]["to"], "0101234%04d" % server.SOLAPI_BATCH_SIZE)
+
+    def test_async_is_rejected(self):
+        fake = self.stub(FakeSolapi())
+        r = self.post([{"to": "01012345678", "text": "a"}], **{"async": True})
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(r.get_json()["error"], "async not supported")
+        self.assertEqual(fake.calls, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+let ROSTER = {};  // /api/roster 에서 받아옴
+
+const TEMPLATES = [
+  { label:"등원 안내", text:"안녕하세요. 서울더함수학학원입니다. {given} 등원하였습니다." },
+  { label:"미등원 안내", text:"안녕하세요. 서울더함수학학원입니다. {given} 아직 등원 하지 않았습니다." },
+  { label:"조퇴 안내", text:"안녕하세요. 서울더함수학학원입니다. {given} 아파서 오늘 조퇴하였습니다. 아이 상태 확인해주세요." },
+  { label:"숙제 미제출", text:"안녕하세요. 서울더함수학학원입니다. {given} 오늘 과제 미제출입니다. 가정에서 점검 부탁드립니다." },
+  { label:"교재 공지", text:"안녕하세요. 서울더함수학학원입니다. {given} 새로운 교재 준비 부탁드립니다." }
+];
+// {given} 기준으로 한 번만 나눠두고 학생/템플릿이 바뀔 때는 이름으로 이어붙이기만 (여러 개여도 모두 치환)
+TEMPLATES.forEach(t => { t.parts = t.text.split("{given}"); });
+
+const state = {
+  currentTeacher: "",
+  currentStudent: null,
+  currentTemplate: TEMPLATES[0], // 현재 선택된 템플릿 원본 저장
+  toType: "parent",
+  defaultFrom: ""
+};
+
+const $ = sel => document.querySelector(sel);
+const $$ = sel => Array.from(document.querySelectorAll(sel));
+
+function givenName(full) {
+  const s = String(full||"").trim();
+  if (!s) return "";
+  if (/^[가-힣]+$/.test(s) && s.length >= 2) return s.slice(1);
+  return s;
+}
+
+function applyText() {
+  const s = state.currentStudent;
+  if(!s || !state.currentTemplate) return;
+  // 템플릿의 {given} 자리에 현재 학생의 이름을 넣어 textarea에 삽입
+  const t = state.currentTemplate;
+  $("#text").value = t.parts.join(givenName(s.name));
+  updatePreview();
+}
+
+function updatePreview() {
+  const s = state.currentStudent;
+  let toNum = "";
+  if(state.toType === "parent") toNum = s?.parentPhone || "";
+  else if(state.toType === "student") toNum = s?.studentPhone || "";
+  else toNum = $("#customTo").value;
+  
+  $("#toPreview").textContent = toNum || "(번호 없음)";
+}
+
+function renderTeachers() {
+  const box = $("#teacherBox"); box.innerHTML = "";
+  Object.keys(ROSTER).forEach(t => {
+    const b = document.createElement("button");
+    b.className = "pill" + (t === state.currentTeacher ? " on" : "");
+    b.textContent = t;
+    b.onclick = () => {
+      state.currentTeacher = t;
+      state.currentStudent = ROSTER[t][0];
+      renderTeachers(); renderStudents(); applyText();
+    };
+    box.appendChild(b);
+  });
+}
+
+function renderStudents() {
+  const box = $("#studentBox"); box.innerHTML = "";
+  const list = ROSTER[state.currentTeacher] || [];
+  const q = $("#search").value.trim();
+  const filtered = q ? list.filter(s => s.name.includes(q)) : list;
+
+  filtered.forEach(s => {
+    const b = document.createElement("button");
+    b.className = "pill" + (state.currentStudent?.id === s.id ? " on" : "");
+    b.textContent = s.name;
+    b.onclick = () => {
+      state.currentStudent = s;
+      renderStudents(); applyText();
+    };
+    box.appendChild(b);
+  });
+}
+
+async function send() {
+  const to = $("#toPreview").textContent.replace(/\D/g, "");
+  const text = $("#text").value.trim();
+  if(!to || !text) return alert("수신번호와 내용을 확인하세요.");
+
+  $("#status").textContent = "전송 중...";
+  try {
+    const res = await fetch("/api/sms", {
+      method: "POST",
+      headers: {"Content-Type": "application/json"},
+      body: JSON.stringify({to, text, from: state.defaultFrom, dry: $("#dry").checked})
+    });
+    const data = await res.json();
+    $("#out").textContent = JSON.stringify(data, null, 2);
+    $("#status").textContent = res.ok ? "성공" : "실패";
+  } catch(e) {
+    $("#status").textContent = "오류";
+  }
+}
+
+// 초기화
+(async () => {
+  const rosterReq = fetch("/api/roster").then(r => r.json());  // 설정과 동시에 요청
+  try {
+    const res = await fetch("/api/sms/config");
+    const cfg = await res.json();
+    state.defaultFrom = cfg.defaultFrom;
+    $("#fromNum").value = cfg.defaultFrom;
+  } catch(e) {}
+
+  // 템플릿 버튼 생성
+  const tplBox = $("#tpls");
+  TEMPLATES.forEach((t, idx) => {
+    const b = document.createElement("button");
+    b.className = "pill" + (idx === 0 ? " on" : "");
+    b.textContent = t.label;
+    b.onclick = () => {
+      $$("#tpls .pill").forEach(btn => btn.classList.remove("on"));
+      b.classList.add("on");
+      state.currentTemplate = t;
+      applyText();
+    };
+    tplBox.appendChild(b);
+  });
+
+  // 수신대상 버튼 이벤트
+  $$("[data-to]").forEach(btn => {
+    btn.onclick = () => {
+      $$("[data-to]").forEach(b => b.classList.remove("on"));
+      btn.classList.add("on");
+      state.toType = btn.dataset.to;
+      $("#customTo").style.display = state.toType === "custom" ? "block" : "none";
+      updatePreview();
+    };
+  });
+
+  try { ROSTER = await rosterReq; } catch(e) {}
+  state.currentTeacher = Object.keys(ROSTER)[0] || "";
+  state.currentStudent = (ROSTER[state.currentTeacher] || [])[0] || null;
+  
+  renderTeachers(); renderStudents(); applyText();
+
+  $("#search").oninput = renderStudents;
+  $("#customTo").oninput = updatePreview;
+  $("#send").onclick = send;
+})();
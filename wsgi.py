@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+# 운영 실행 (Render 등):
+#   gunicorn -c gunicorn_conf.py wsgi:app
+# 로컬 개발은 python nurigo_server_fixed.py
+
+# preload_app 이라 마스터에서 앱을 import 함 → requests/ssl 보다 먼저 gevent 패치
+from gevent import monkey
+monkey.patch_all()
+
+from nurigo_server_fixed import app